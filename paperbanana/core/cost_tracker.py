@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 import math
 from dataclasses import dataclass, field
 
@@ -99,12 +100,14 @@ class CostTracker:
             pricing_known=known,
         )
         self._entries.append(entry)
-        logger.debug(
-            "Cost tracked (VLM)",
-            agent=agent,
-            cost=f"${cost:.6f}",
-            total=f"${self.total_cost:.6f}",
-        )
+        # Formatting the running total sums every entry; skip it when DEBUG is filtered.
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Cost tracked (VLM)",
+                agent=agent,
+                cost=f"${cost:.6f}",
+                total=f"${self.total_cost:.6f}",
+            )
         if self.is_over_budget:
             logger.warning(
                 "Budget exceeded during VLM call",
@@ -147,12 +150,13 @@ class CostTracker:
             pricing_known=known,
         )
         self._entries.append(entry)
-        logger.debug(
-            "Cost tracked (image)",
-            agent=agent,
-            cost=f"${cost:.6f}",
-            total=f"${self.total_cost:.6f}",
-        )
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Cost tracked (image)",
+                agent=agent,
+                cost=f"${cost:.6f}",
+                total=f"${self.total_cost:.6f}",
+            )
         if self.is_over_budget:
             logger.warning(
                 "Budget exceeded during image call",
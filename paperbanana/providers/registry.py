@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import functools
+import importlib
+
 import structlog
 
 from paperbanana.core.config import Settings
@@ -9,6 +12,46 @@ from paperbanana.providers.base import ImageGenProvider, VLMProvider
 
 logger = structlog.get_logger()
 
+# Provider classes are imported on first use so optional SDKs are only loaded for
+# configured providers; the resolved class is then reused by later factory calls.
+_VLM_CLASSES: dict[str, tuple[str, str]] = {
+    "gemini": ("paperbanana.providers.vlm.gemini", "GeminiVLM"),
+    "openrouter": ("paperbanana.providers.vlm.openrouter", "OpenRouterVLM"),
+    "openai": ("paperbanana.providers.vlm.openai", "OpenAIVLM"),
+    "atlas": ("paperbanana.providers.vlm.atlas", "AtlasVLM"),
+    "bedrock": ("paperbanana.providers.vlm.bedrock", "BedrockVLM"),
+    "anthropic": ("paperbanana.providers.vlm.anthropic", "AnthropicVLM"),
+    "ollama": ("paperbanana.providers.vlm.ollama", "OllamaVLM"),
+    "openai_local": ("paperbanana.providers.vlm.openai", "OpenAIVLM"),
+    "claude_code": ("paperbanana.providers.vlm.claude_code", "ClaudeCodeVLM"),
+    "litellm": ("paperbanana.providers.vlm.litellm", "LiteLLMVLM"),
+}
+
+_IMAGE_GEN_CLASSES: dict[str, tuple[str, str]] = {
+    "none": ("paperbanana.providers.image_gen.dummy", "DummyImageGen"),
+    "google_imagen": ("paperbanana.providers.image_gen.google_imagen", "GoogleImagenGen"),
+    "openrouter_imagen": (
+        "paperbanana.providers.image_gen.openrouter_imagen",
+        "OpenRouterImageGen",
+    ),
+    "openai_imagen": ("paperbanana.providers.image_gen.openai_imagen", "OpenAIImageGen"),
+    "atlas_imagen": ("paperbanana.providers.image_gen.atlas_imagen", "AtlasImageGen"),
+    "bedrock_imagen": ("paperbanana.providers.image_gen.bedrock_imagen", "BedrockImageGen"),
+}
+
+
+@functools.cache
+def _import_provider_class(module_name: str, class_name: str) -> type:
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _vlm_class(provider: str) -> type[VLMProvider]:
+    return _import_provider_class(*_VLM_CLASSES[provider])
+
+
+def _image_gen_class(provider: str) -> type[ImageGenProvider]:
+    return _import_provider_class(*_IMAGE_GEN_CLASSES[provider])
+
 
 _API_KEY_HINTS = {
     "GOOGLE_API_KEY": (
@@ -94,68 +137,52 @@ class ProviderRegistry:
 
         if provider == "gemini":
             _validate_api_key(settings.google_api_key, "GOOGLE_API_KEY")
-            from paperbanana.providers.vlm.gemini import GeminiVLM
-
-            return GeminiVLM(
+            return _vlm_class("gemini")(
                 api_key=settings.google_api_key,
                 model=settings.google_vlm_model or settings.vlm_model,
                 base_url=settings.google_base_url,
             )
         elif provider == "openrouter":
             _validate_api_key(settings.openrouter_api_key, "OPENROUTER_API_KEY")
-            from paperbanana.providers.vlm.openrouter import OpenRouterVLM
-
-            return OpenRouterVLM(
+            return _vlm_class("openrouter")(
                 api_key=settings.openrouter_api_key,
                 model=settings.vlm_model,
             )
         elif provider == "openai":
             _validate_api_key(settings.openai_api_key, "OPENAI_API_KEY")
-            from paperbanana.providers.vlm.openai import OpenAIVLM
-
-            return OpenAIVLM(
+            return _vlm_class("openai")(
                 api_key=settings.openai_api_key,
                 model=settings.openai_vlm_model or settings.vlm_model,
                 base_url=settings.openai_base_url,
             )
         elif provider == "atlas":
             _validate_api_key(settings.atlascloud_api_key, "ATLASCLOUD_API_KEY")
-            from paperbanana.providers.vlm.atlas import AtlasVLM
-
-            return AtlasVLM(
+            return _vlm_class("atlas")(
                 api_key=settings.atlascloud_api_key,
                 model=settings.atlascloud_vlm_model or settings.vlm_model,
                 base_url=settings.atlascloud_base_url,
             )
         elif provider == "bedrock":
             _validate_bedrock_auth(settings.aws_region, settings.aws_profile)
-            from paperbanana.providers.vlm.bedrock import BedrockVLM
-
-            return BedrockVLM(
+            return _vlm_class("bedrock")(
                 model=settings.bedrock_vlm_model or settings.vlm_model,
                 region=settings.aws_region,
                 profile=settings.aws_profile,
             )
         elif provider == "anthropic":
             _validate_api_key(settings.anthropic_api_key, "ANTHROPIC_API_KEY")
-            from paperbanana.providers.vlm.anthropic import AnthropicVLM
-
-            return AnthropicVLM(
+            return _vlm_class("anthropic")(
                 api_key=settings.anthropic_api_key,
                 model=settings.vlm_model,
             )
         elif provider == "ollama":
-            from paperbanana.providers.vlm.ollama import OllamaVLM
-
-            return OllamaVLM(
+            return _vlm_class("ollama")(
                 model=settings.ollama_model or settings.vlm_model,
                 base_url=settings.ollama_base_url,
                 json_mode=settings.ollama_json_mode,
             )
         elif provider == "openai_local":
-            from paperbanana.providers.vlm.openai import OpenAIVLM
-
-            return OpenAIVLM(
+            return _vlm_class("openai_local")(
                 api_key=settings.openai_api_key or "not-needed",
                 model=settings.openai_vlm_model or settings.vlm_model,
                 base_url=settings.openai_local_base_url,
@@ -163,9 +190,7 @@ class ProviderRegistry:
                 provider_name="openai_local",
             )
         elif provider == "claude_code":
-            from paperbanana.providers.vlm.claude_code import ClaudeCodeVLM
-
-            vlm = ClaudeCodeVLM(model=settings.vlm_model)
+            vlm = _vlm_class("claude_code")(model=settings.vlm_model)
             if not vlm.is_available():
                 raise ValueError(
                     "claude CLI not found in PATH.\n\n"
@@ -174,9 +199,7 @@ class ProviderRegistry:
                 )
             return vlm
         elif provider == "litellm":
-            from paperbanana.providers.vlm.litellm import LiteLLMVLM
-
-            vlm = LiteLLMVLM(
+            vlm = _vlm_class("litellm")(
                 model=settings.litellm_model or settings.vlm_model,
                 api_key=settings.litellm_api_key,
                 api_base=settings.litellm_api_base,
@@ -205,51 +228,37 @@ class ProviderRegistry:
         )
 
         if provider == "none":
-            from paperbanana.providers.image_gen.dummy import DummyImageGen
-
-            return DummyImageGen()
+            return _image_gen_class("none")()
         elif provider == "google_imagen":
             _validate_api_key(settings.google_api_key, "GOOGLE_API_KEY")
-            from paperbanana.providers.image_gen.google_imagen import GoogleImagenGen
-
-            return GoogleImagenGen(
+            return _image_gen_class("google_imagen")(
                 api_key=settings.google_api_key,
                 model=settings.google_image_model or settings.image_model,
                 base_url=settings.google_base_url,
             )
         elif provider == "openrouter_imagen":
             _validate_api_key(settings.openrouter_api_key, "OPENROUTER_API_KEY")
-            from paperbanana.providers.image_gen.openrouter_imagen import (
-                OpenRouterImageGen,
-            )
-
-            return OpenRouterImageGen(
+            return _image_gen_class("openrouter_imagen")(
                 api_key=settings.openrouter_api_key,
                 model=settings.image_model,
             )
         elif provider == "openai_imagen":
             _validate_api_key(settings.openai_api_key, "OPENAI_API_KEY")
-            from paperbanana.providers.image_gen.openai_imagen import OpenAIImageGen
-
-            return OpenAIImageGen(
+            return _image_gen_class("openai_imagen")(
                 api_key=settings.openai_api_key,
                 model=settings.openai_image_model or settings.image_model,
                 base_url=settings.openai_base_url,
             )
         elif provider == "atlas_imagen":
             _validate_api_key(settings.atlascloud_api_key, "ATLASCLOUD_API_KEY")
-            from paperbanana.providers.image_gen.atlas_imagen import AtlasImageGen
-
-            return AtlasImageGen(
+            return _image_gen_class("atlas_imagen")(
                 api_key=settings.atlascloud_api_key,
                 model=settings.atlascloud_image_model or settings.image_model,
                 base_url=settings.atlascloud_image_base_url,
             )
         elif provider == "bedrock_imagen":
             _validate_bedrock_auth(settings.aws_region, settings.aws_profile)
-            from paperbanana.providers.image_gen.bedrock_imagen import BedrockImageGen
-
-            return BedrockImageGen(
+            return _image_gen_class("bedrock_imagen")(
                 model=settings.bedrock_image_model or settings.image_model,
                 region=settings.aws_region,
                 profile=settings.aws_profile,
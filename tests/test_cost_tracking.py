@@ -6,6 +6,7 @@ import pytest
 
 from paperbanana.core.cost_estimator import estimate_cost
 from paperbanana.core.cost_tracker import CostTracker
+from paperbanana.core.logging import configure_logging
 from paperbanana.core.pricing import lookup_image_price, lookup_vlm_price
 
 # ── Pricing lookup ──────────────────────────────────────────────────
@@ -193,6 +194,24 @@ class TestCostTracker:
         assert tracker.total_cost == pytest.approx(0.58)
         assert tracker.pricing_complete is True
 
+    def test_debug_totals_skipped_when_debug_logging_disabled(self, monkeypatch):
+        configure_logging(verbose=False)
+        totals_computed = 0
+
+        def counting_total(self):
+            nonlocal totals_computed
+            totals_computed += 1
+            return sum(e.cost_usd for e in self._entries)
+
+        monkeypatch.setattr(CostTracker, "total_cost", property(counting_total))
+        tracker = CostTracker()
+        tracker.record_vlm_call(
+            provider="gemini", model="gemini-2.0-flash", input_tokens=10, output_tokens=10
+        )
+        tracker.record_image_call(provider="google_imagen", model="gemini-3-pro-image-preview")
+
+        assert totals_computed == 0
+
 
 # ── Budget guard ────────────────────────────────────────────────────
 
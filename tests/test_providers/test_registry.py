@@ -5,6 +5,7 @@ from __future__ import annotations
 import pytest
 
 from paperbanana.core.config import Settings
+from paperbanana.providers import registry as registry_module
 from paperbanana.providers.registry import ProviderRegistry
 
 
@@ -196,3 +197,27 @@ def test_plot_hardcodes_none_image_provider():
 
     src = inspect.getsource(cli.plot)
     assert 'overrides["image_provider"] = "none"' in src
+
+
+def test_provider_class_tables_resolve_to_provider_types():
+    """Every registry entry names an importable provider class of the right kind."""
+    from paperbanana.providers.base import ImageGenProvider, VLMProvider
+    from paperbanana.providers.registry import _image_gen_class, _vlm_class
+
+    for provider in registry_module._VLM_CLASSES:
+        assert issubclass(_vlm_class(provider), VLMProvider)
+    for provider in registry_module._IMAGE_GEN_CLASSES:
+        assert issubclass(_image_gen_class(provider), ImageGenProvider)
+
+
+def test_provider_class_is_imported_once_across_factory_calls():
+    """Repeated provider creation reuses the resolved class instead of re-importing."""
+    settings = Settings(vlm_provider="gemini", google_api_key="test-key")
+    registry_module._import_provider_class.cache_clear()
+
+    ProviderRegistry.create_vlm(settings)
+    ProviderRegistry.create_vlm(settings)
+
+    cache_info = registry_module._import_provider_class.cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 1
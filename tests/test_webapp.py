@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
 import os
+import time
 from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
-from fastapi import BackgroundTasks, HTTPException, Request
+import structlog
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
 from PIL import Image
 from pydantic import ValidationError
 
@@ -75,6 +81,28 @@ async def test_generate_rejects_streamed_body_over_limit_before_json_parsing(mon
     assert status == 413
 
 
+async def test_web_logging_renders_json_lines(capsys) -> None:
+    """The served app logs one JSON object per line with level and timestamp."""
+    try:
+        await webapp_main._configure_web_logging()
+        structlog.get_logger().info("Generation completed", job_id="job-log")
+        record = json.loads(capsys.readouterr().out.strip())
+    finally:
+        structlog.reset_defaults()
+
+    assert record["event"] == "Generation completed"
+    assert record["job_id"] == "job-log"
+    assert record["level"] == "info"
+    assert "timestamp" in record
+
+
+def test_web_log_level_is_validated_at_import() -> None:
+    assert webapp_main._parse_web_log_level("warning") == logging.WARNING
+
+    with pytest.raises(ValueError, match="WEB_LOG_LEVEL 'verbose'.*DEBUG, INFO"):
+        webapp_main._parse_web_log_level("verbose")
+
+
 def test_update_job_progress_maps_visualizer_event() -> None:
     """Structured pipeline progress updates the web job shown to clients."""
     job_id = "job-1"
@@ -98,6 +126,44 @@ def test_update_job_progress_maps_visualizer_event() -> None:
     assert jobs[job_id]["progress"] == "Generating candidate image"
 
 
+async def test_status_stream_pushes_updates_until_job_finishes() -> None:
+    """Status streams emit on each job change and close once the job is terminal."""
+    jobs.clear()
+    jobs["job-stream"] = {"status": "running", "progress": "Initializing pipeline..."}
+    stream = webapp_main.stream_status("job-stream", jobs["job-stream"])
+
+    first = await stream.__anext__()
+    next_update = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    update_job_progress(
+        "job-stream",
+        PipelineProgressEvent(
+            stage=PipelineProgressStage.PLANNER_START,
+            message="Planning diagram",
+        ),
+    )
+    second = await asyncio.wait_for(next_update, timeout=1)
+    jobs["job-stream"]["status"] = "completed"
+    webapp_main._notify_status_listeners("job-stream")
+    third = await asyncio.wait_for(stream.__anext__(), timeout=1)
+
+    assert first.progress == "Initializing pipeline..."
+    assert second.agent == "planner"
+    assert third.status == "completed"
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert "job-stream" not in webapp_main.status_listeners
+
+
+def test_status_stream_rejects_unknown_job_before_streaming() -> None:
+    jobs.clear()
+
+    with pytest.raises(HTTPException) as exc_info:
+        webapp_main._existing_job("missing")
+
+    assert exc_info.value.status_code == 404
+
+
 def test_generate_request_rejects_oversized_text() -> None:
     """Generation inputs are bounded before an operator-funded job is queued."""
     with pytest.raises(ValidationError):
@@ -117,6 +183,14 @@ def test_generate_request_rejects_unknown_fields() -> None:
         )
 
 
+def test_status_response_snapshots_are_immutable() -> None:
+    """Status snapshots pushed to clients cannot be altered after they are built."""
+    status = webapp_main.StatusResponse(job_id="job", status="running")
+
+    with pytest.raises(ValidationError):
+        status.status = "completed"
+
+
 def test_generation_limits_reject_when_capacity_is_full(monkeypatch) -> None:
     """No additional operator-funded job is accepted at global capacity."""
     jobs.clear()
@@ -138,10 +212,12 @@ async def test_queuing_job_reserves_space_within_stored_job_limit(monkeypatch) -
     monkeypatch.setattr(webapp_main, "MAX_ACTIVE_JOBS", 10)
     monkeypatch.setattr(webapp_main, "MAX_GLOBAL_REQUESTS_PER_HOUR", 10)
     monkeypatch.setattr(webapp_main, "MAX_CLIENT_REQUESTS_PER_HOUR", 10)
+    monkeypatch.setattr(webapp_main, "generation_queue", asyncio.Queue())
+    finished_base = time.monotonic()
     for index in range(3):
         jobs[f"old-{index}"] = {
             "status": "completed",
-            "finished_at": float(index),
+            "finished_at": finished_base + index,
         }
     request = Request(
         {
@@ -155,7 +231,6 @@ async def test_queuing_job_reserves_space_within_stored_job_limit(monkeypatch) -
 
     await webapp_main.generate(
         GenerateRequest(text="method", caption="diagram", iterations=1),
-        BackgroundTasks(),
         request,
     )
 
@@ -172,6 +247,7 @@ async def test_queuing_rejects_when_stored_jobs_are_all_active(monkeypatch) -> N
     monkeypatch.setattr(webapp_main, "MAX_ACTIVE_JOBS", 10)
     monkeypatch.setattr(webapp_main, "MAX_GLOBAL_REQUESTS_PER_HOUR", 10)
     monkeypatch.setattr(webapp_main, "MAX_CLIENT_REQUESTS_PER_HOUR", 10)
+    monkeypatch.setattr(webapp_main, "generation_queue", asyncio.Queue())
     jobs["running"] = {"status": "running"}
     jobs["queued"] = {"status": "queued"}
     request = Request(
@@ -187,7 +263,6 @@ async def test_queuing_rejects_when_stored_jobs_are_all_active(monkeypatch) -> N
     with pytest.raises(HTTPException) as exc_info:
         await webapp_main.generate(
             GenerateRequest(text="method", caption="diagram", iterations=1),
-            BackgroundTasks(),
             request,
         )
 
@@ -195,6 +270,19 @@ async def test_queuing_rejects_when_stored_jobs_are_all_active(monkeypatch) -> N
     assert len(jobs) == 2
 
 
+def test_prune_jobs_forgets_finished_jobs_after_ttl(monkeypatch) -> None:
+    """Finished jobs do not outlive their run files, even below the stored-job cap."""
+    jobs.clear()
+    monkeypatch.setattr(webapp_main, "WEB_RUN_TTL_SECONDS", 50.0)
+    jobs["expired"] = {"status": "failed", "finished_at": 100.0}
+    jobs["recent"] = {"status": "completed", "finished_at": 160.0}
+    jobs["running"] = {"status": "running", "created_at": 0.0}
+
+    webapp_main.prune_jobs(now=200.0)
+
+    assert set(jobs) == {"recent", "running"}
+
+
 def test_generation_limits_enforce_global_hourly_cap(monkeypatch) -> None:
     """Accepted requests remain globally bounded even when clients rotate."""
     jobs.clear()
@@ -312,17 +400,175 @@ async def test_queued_job_does_not_retain_source_inputs(monkeypatch) -> None:
             "client": ("127.0.0.1", 1234),
         }
     )
-    background_tasks = BackgroundTasks()
+    queue: asyncio.Queue = asyncio.Queue()
+    monkeypatch.setattr(webapp_main, "generation_queue", queue)
 
     response = await webapp_main.generate(
         GenerateRequest(text="method details", caption="diagram", iterations=1),
-        background_tasks,
         request,
     )
 
     assert "text" not in jobs[response.job_id]
     assert "caption" not in jobs[response.job_id]
-    assert len(background_tasks.tasks) == 1
+    assert queue.get_nowait() == (response.job_id, "method details", "diagram", 1)
+
+
+async def test_job_queued_behind_busy_workers_reports_waiting(monkeypatch) -> None:
+    """Clients can tell a job is waiting for a worker slot rather than stalled."""
+    jobs.clear()
+    webapp_main.global_request_history.clear()
+    webapp_main.client_request_history.clear()
+    monkeypatch.setattr(webapp_main, "MAX_ACTIVE_JOBS", 10)
+    monkeypatch.setattr(webapp_main, "MAX_GLOBAL_REQUESTS_PER_HOUR", 10)
+    monkeypatch.setattr(webapp_main, "MAX_CLIENT_REQUESTS_PER_HOUR", 10)
+    monkeypatch.setattr(webapp_main, "WEB_GENERATION_WORKERS", 1)
+    monkeypatch.setattr(webapp_main, "generation_queue", asyncio.Queue())
+    jobs["running"] = {"status": "running"}
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/generate",
+            "headers": [],
+            "client": ("127.0.0.1", 1234),
+        }
+    )
+
+    response = await webapp_main.generate(
+        GenerateRequest(text="method", caption="diagram", iterations=1),
+        request,
+    )
+
+    assert jobs[response.job_id]["progress"] == "Waiting for a free generation worker..."
+
+
+async def test_generation_worker_runs_queued_jobs_and_survives_failures(monkeypatch) -> None:
+    """A failing job does not stop the worker from draining the rest of the queue."""
+    queue: asyncio.Queue = asyncio.Queue()
+    started: list[str] = []
+
+    async def fake_run_generation(job_id, text, caption, iterations):
+        started.append(job_id)
+        if job_id == "job-broken":
+            raise KeyError(job_id)
+
+    monkeypatch.setattr(webapp_main, "run_generation", fake_run_generation)
+    queue.put_nowait(("job-broken", "source", "caption", 1))
+    queue.put_nowait(("job-ok", "source", "caption", 1))
+
+    worker = asyncio.create_task(webapp_main._generation_worker(queue))
+    await asyncio.wait_for(queue.join(), timeout=1)
+    worker.cancel()
+
+    assert started == ["job-broken", "job-ok"]
+
+
+async def test_generate_rejects_when_no_generation_worker_is_running(monkeypatch) -> None:
+    """Jobs are not accepted when nothing could ever start them."""
+    jobs.clear()
+    monkeypatch.setattr(webapp_main, "generation_queue", None)
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/generate",
+            "headers": [],
+            "client": ("127.0.0.1", 1234),
+        }
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await webapp_main.generate(
+            GenerateRequest(text="method", caption="diagram", iterations=1),
+            request,
+        )
+
+    assert exc_info.value.status_code == 503
+    assert jobs == {}
+
+
+async def test_stopping_workers_fails_jobs_left_in_the_queue(monkeypatch) -> None:
+    """Queued jobs from a finished app lifecycle are failed, not carried forward."""
+    jobs.clear()
+    monkeypatch.setattr(webapp_main, "WEB_GENERATION_WORKERS", 1)
+    monkeypatch.setattr(webapp_main, "run_generation", lambda *args: asyncio.Event().wait())
+    await webapp_main._start_generation_workers()
+    jobs["left-behind"] = {"status": "queued"}
+    webapp_main.generation_queue.put_nowait(("left-behind", "source", "caption", 1))
+
+    await webapp_main._stop_generation_workers()
+
+    assert webapp_main.generation_queue is None
+    assert jobs["left-behind"]["status"] == "failed"
+
+
+async def test_stopping_workers_fails_the_job_they_were_running(monkeypatch) -> None:
+    """A job cut off by shutdown is failed so it does not hold the active-job slot."""
+    jobs.clear()
+    webapp_main.global_request_history.clear()
+    webapp_main.client_request_history.clear()
+    monkeypatch.setattr(webapp_main, "WEB_GENERATION_WORKERS", 1)
+    monkeypatch.setattr(webapp_main, "MAX_ACTIVE_JOBS", 1)
+    started = asyncio.Event()
+
+    async def never_finishing_generation(job_id, text, caption, iterations):
+        jobs[job_id]["status"] = "running"
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(webapp_main, "run_generation", never_finishing_generation)
+    await webapp_main._start_generation_workers()
+    jobs["in-flight"] = {"status": "queued"}
+    webapp_main.generation_queue.put_nowait(("in-flight", "source", "caption", 1))
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    await webapp_main._stop_generation_workers()
+    await webapp_main._start_generation_workers()
+    try:
+        assert jobs["in-flight"]["status"] == "failed"
+        webapp_main.enforce_generation_limits("client-1")
+    finally:
+        await webapp_main._stop_generation_workers()
+
+
+def test_jobs_run_after_the_app_is_started_a_second_time(monkeypatch, tmp_path) -> None:
+    """The generation queue is rebuilt on each startup, bound to that serving loop."""
+    runs_dir = tmp_path / "web-runs"
+    final_image = runs_dir / "run_restart" / "final_output.png"
+    final_image.parent.mkdir(parents=True)
+    Image.new("RGB", (2, 2), color="white").save(final_image, format="PNG")
+
+    def fake_settings():
+        return SimpleNamespace(budget_usd=None, refinement_iterations=3, save_iterations=False)
+
+    class FakePipeline:
+        def __init__(self, settings=None):
+            self.settings = settings
+
+        async def generate(self, input_data, progress_callback=None):
+            return SimpleNamespace(image_path=final_image, iterations=[])
+
+    monkeypatch.setattr(webapp_main, "WEB_RUNS_DIR", runs_dir)
+    monkeypatch.setattr(webapp_main, "Settings", fake_settings)
+    monkeypatch.setattr(webapp_main, "PaperBananaPipeline", FakePipeline)
+    monkeypatch.setattr(webapp_main, "_configure_web_logging", lambda: asyncio.sleep(0))
+    monkeypatch.setattr(webapp_main, "MAX_GLOBAL_REQUESTS_PER_HOUR", 10)
+    monkeypatch.setattr(webapp_main, "MAX_CLIENT_REQUESTS_PER_HOUR", 10)
+    jobs.clear()
+    webapp_main.global_request_history.clear()
+    webapp_main.client_request_history.clear()
+
+    for _ in range(2):
+        with TestClient(webapp_main.app) as client:
+            response = client.post(
+                "/api/generate", json={"text": "method", "caption": "diagram", "iterations": 1}
+            )
+            job_id = response.json()["job_id"]
+            # The stream ends once the job is terminal, so shutdown never races the worker.
+            with client.stream("GET", f"/api/status/{job_id}/stream") as stream:
+                events = [line for line in stream.iter_lines() if line.startswith("data:")]
+
+        assert json.loads(events[-1].removeprefix("data:"))["status"] == "completed"
 
 
 async def test_job_budget_is_set_before_pipeline_initialization(monkeypatch, tmp_path) -> None:
@@ -356,6 +602,113 @@ async def test_job_budget_is_set_before_pipeline_initialization(monkeypatch, tmp
     assert settings.budget_usd == webapp_main.WEB_JOB_BUDGET_USD
 
 
+async def test_each_job_builds_its_own_pipeline(monkeypatch, tmp_path) -> None:
+    """Pipelines are not pooled: each job needs its own budget tracker and run directory."""
+    built: list[object] = []
+
+    def fake_settings():
+        return SimpleNamespace(budget_usd=None, refinement_iterations=3, save_iterations=False)
+
+    class FakePipeline:
+        def __init__(self, settings=None):
+            self.settings = settings
+            built.append(self)
+
+        async def generate(self, input_data, progress_callback=None):
+            return SimpleNamespace(image_path=tmp_path / "final.png", iterations=[])
+
+    monkeypatch.setattr(webapp_main, "Settings", fake_settings)
+    monkeypatch.setattr(webapp_main, "PaperBananaPipeline", FakePipeline)
+    jobs.clear()
+    jobs["first"] = {"status": "queued"}
+    jobs["second"] = {"status": "queued"}
+
+    await webapp_main.run_generation("first", "source", "caption", 1)
+    await webapp_main.run_generation("second", "source", "caption", 2)
+
+    assert len(built) == 2
+    assert built[0] is not built[1]
+    assert built[0].settings is not built[1].settings
+
+
+async def test_pipeline_progress_reaches_job_state(monkeypatch, tmp_path) -> None:
+    """The pipeline's progress callback updates the job it was started for."""
+    runs_dir = tmp_path / "web-runs"
+    run_dir = runs_dir / "run_progress"
+    run_dir.mkdir(parents=True)
+    final_image = run_dir / "final_output.png"
+    Image.new("RGB", (2, 2), color="white").save(final_image, format="PNG")
+    seen_progress: list[str] = []
+
+    def fake_settings():
+        return SimpleNamespace(budget_usd=None, refinement_iterations=3, save_iterations=False)
+
+    class FakePipeline:
+        def __init__(self, settings=None):
+            self.settings = settings
+
+        async def generate(self, input_data, progress_callback=None):
+            progress_callback(
+                PipelineProgressEvent(
+                    stage=PipelineProgressStage.CRITIC_START,
+                    message="Reviewing candidate",
+                    iteration=1,
+                )
+            )
+            seen_progress.append(jobs["progress-job"]["progress"])
+            return SimpleNamespace(image_path=final_image, iterations=[])
+
+    monkeypatch.setattr(webapp_main, "WEB_RUNS_DIR", runs_dir)
+    monkeypatch.setattr(webapp_main, "Settings", fake_settings)
+    monkeypatch.setattr(webapp_main, "PaperBananaPipeline", FakePipeline)
+    jobs.clear()
+    jobs["progress-job"] = {"status": "queued"}
+
+    await webapp_main.run_generation("progress-job", "source", "caption", 1)
+
+    assert seen_progress == ["Reviewing candidate"]
+    assert jobs["progress-job"]["agent"] == "critic"
+    assert jobs["progress-job"]["status"] == "completed"
+
+
+async def test_result_urls_are_recorded_when_job_completes(monkeypatch, tmp_path) -> None:
+    """Result URLs are derived once at completion and returned as-is by the result API."""
+    runs_dir = tmp_path / "web-runs"
+    run_dir = runs_dir / "run_urls"
+    (run_dir / "iterations").mkdir(parents=True)
+    final_image = run_dir / "final_output.png"
+    Image.new("RGB", (2, 2), color="white").save(final_image, format="PNG")
+    iteration_paths = [run_dir / "iterations" / f"iter_{index}.png" for index in (1, 2)]
+
+    def fake_settings():
+        return SimpleNamespace(budget_usd=None, refinement_iterations=3, save_iterations=False)
+
+    class FakePipeline:
+        def __init__(self, settings=None):
+            self.settings = settings
+
+        async def generate(self, input_data, progress_callback=None):
+            return SimpleNamespace(
+                image_path=final_image,
+                iterations=[SimpleNamespace(image_path=path) for path in iteration_paths],
+            )
+
+    monkeypatch.setattr(webapp_main, "WEB_RUNS_DIR", runs_dir)
+    monkeypatch.setattr(webapp_main, "Settings", fake_settings)
+    monkeypatch.setattr(webapp_main, "PaperBananaPipeline", FakePipeline)
+    jobs.clear()
+    jobs["urls"] = {"status": "queued"}
+
+    await webapp_main.run_generation("urls", "source", "caption", 2)
+    result = await webapp_main.get_result("urls", jobs["urls"])
+
+    assert result.final_image == "/api/result/urls/image/final_output.png"
+    assert result.iteration_images == [
+        "/api/result/urls/image/iter_1.png",
+        "/api/result/urls/image/iter_2.png",
+    ]
+
+
 @pytest.mark.parametrize("invalid_path", ["empty", "missing", "outside", "not-image"])
 async def test_generation_fails_when_final_output_is_not_a_recorded_web_image(
     monkeypatch, tmp_path, invalid_path: str
@@ -433,12 +786,38 @@ async def test_image_endpoint_allows_only_recorded_images_with_correct_mime(tmp_
     response = await webapp_main.get_image("job-images", "final.jpg")
     assert response.media_type == "image/jpeg"
     assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["cache-control"] == (
+        f"private, max-age={int(webapp_main.WEB_RUN_TTL_SECONDS)}, immutable"
+    )
 
     with pytest.raises(HTTPException) as exc_info:
         await webapp_main.get_image("job-images", "metadata.json")
     assert exc_info.value.status_code == 404
 
 
+async def test_frontend_is_served_from_startup_cache(monkeypatch, tmp_path) -> None:
+    """The homepage is read once at startup rather than on every request."""
+    html_path = tmp_path / "index.html"
+    html_path.write_text("<h1>cached</h1>", encoding="utf-8")
+    monkeypatch.setattr(webapp_main, "FRONTEND_HTML_PATH", html_path)
+
+    await webapp_main._load_frontend()
+    html_path.unlink()
+    response = await webapp_main.root()
+
+    assert response.status_code == 200
+    assert response.body == b"<h1>cached</h1>"
+
+
+async def test_missing_frontend_is_reported_without_blocking_startup(monkeypatch, tmp_path):
+    monkeypatch.setattr(webapp_main, "FRONTEND_HTML_PATH", tmp_path / "missing.html")
+
+    await webapp_main._load_frontend()
+    response = await webapp_main.root()
+
+    assert response.status_code == 404
+
+
 def test_frontend_renders_errors_as_text() -> None:
     """Provider errors cannot inject HTML into the public page."""
     html_path = Path(webapp_main.__file__).parent / "static" / "index.html"
@@ -2,18 +2,21 @@
 
 import asyncio
 import contextlib
+import functools
+import logging
 import os
 import shutil
 import time
 import uuid
 from collections import defaultdict, deque
 from pathlib import Path
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Optional
 
 import structlog
 from dotenv import load_dotenv
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.sse import EventSourceResponse
 from fastapi.staticfiles import StaticFiles
 from PIL import Image, UnidentifiedImageError
 from pydantic import BaseModel, ConfigDict, Field
@@ -32,6 +35,7 @@ MAX_TEXT_CHARS = int(os.getenv("WEB_MAX_TEXT_CHARS", "40000"))
 MAX_CAPTION_CHARS = int(os.getenv("WEB_MAX_CAPTION_CHARS", "2000"))
 MAX_REQUEST_BYTES = int(os.getenv("WEB_MAX_REQUEST_BYTES", "262144"))
 MAX_ACTIVE_JOBS = int(os.getenv("WEB_MAX_ACTIVE_JOBS", "1"))
+WEB_GENERATION_WORKERS = max(int(os.getenv("WEB_GENERATION_WORKERS", "1")), 1)
 MAX_GLOBAL_REQUESTS_PER_HOUR = int(os.getenv("WEB_MAX_GLOBAL_REQUESTS_PER_HOUR", "4"))
 MAX_CLIENT_REQUESTS_PER_HOUR = int(os.getenv("WEB_MAX_CLIENT_REQUESTS_PER_HOUR", "2"))
 MAX_STORED_JOBS = int(os.getenv("WEB_MAX_STORED_JOBS", "100"))
@@ -45,7 +49,28 @@ TRUST_PROXY_HEADERS = os.getenv("WEB_TRUST_PROXY_HEADERS", "false").lower() in {
     "true",
     "yes",
 }
+_WEB_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+def _parse_web_log_level(value: str) -> int:
+    try:
+        return _WEB_LOG_LEVELS[value.strip().upper()]
+    except KeyError:
+        raise ValueError(
+            f"Invalid WEB_LOG_LEVEL {value!r}; expected one of: {', '.join(_WEB_LOG_LEVELS)}"
+        ) from None
+
+
+WEB_LOG_LEVEL = _parse_web_log_level(os.getenv("WEB_LOG_LEVEL", "INFO"))
 RATE_WINDOW_SECONDS = 3600.0
+_ACTIVE_STATUSES = frozenset({"queued", "running"})
+_TERMINAL_STATUSES = frozenset({"completed", "failed"})
 
 
 class RequestBodyLimitMiddleware:
@@ -106,12 +131,38 @@ class RequestBodyLimitMiddleware:
 app = FastAPI(title="PaperBanana Web UI")
 app.add_middleware(RequestBodyLimitMiddleware)
 
+
+async def _configure_web_logging() -> None:
+    """Emit JSON log lines straight to stdout and build each logger only once."""
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.dict_tracebacks,
+            structlog.processors.JSONRenderer(),
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(WEB_LOG_LEVEL),
+        logger_factory=structlog.WriteLoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
+app.router.add_event_handler("startup", _configure_web_logging)
+
 # Bounded in-memory job and rate-limit state.
 jobs: Dict[str, dict] = {}
 global_request_history: deque[float] = deque()
 client_request_history: dict[str, deque[float]] = defaultdict(deque)
+# Per-job wake-up queues for open status streams; each holds at most one pending signal.
+status_listeners: dict[str, set[asyncio.Queue[None]]] = {}
 _run_cleanup_task: asyncio.Task[None] | None = None
 
+# Accepted jobs wait here until one of the fixed generation workers picks them up. The
+# queue only exists while workers run, so it is always bound to the serving event loop.
+generation_queue: asyncio.Queue[tuple[str, str, str, int]] | None = None
+_generation_workers: list[asyncio.Task[None]] = []
+
 
 class GenerateRequest(BaseModel):
     """Request model for diagram generation."""
@@ -136,6 +187,8 @@ class GenerateRequest(BaseModel):
 class GenerateResponse(BaseModel):
     """Response model for generation request."""
 
+    model_config = ConfigDict(frozen=True)
+
     job_id: str
     status: str = "queued"
 
@@ -143,6 +196,8 @@ class GenerateResponse(BaseModel):
 class StatusResponse(BaseModel):
     """Response model for job status."""
 
+    model_config = ConfigDict(frozen=True)
+
     job_id: str
     status: str  # queued, running, completed, failed
     phase: Optional[str] = None  # planning, refinement
@@ -156,6 +211,8 @@ class StatusResponse(BaseModel):
 class ResultResponse(BaseModel):
     """Response model for completed job result."""
 
+    model_config = ConfigDict(frozen=True)
+
     job_id: str
     status: str
     final_image: Optional[str] = None  # URL to final image
@@ -204,7 +261,7 @@ def _protected_run_directories(root: Path) -> tuple[set[Path], float | None]:
     protected: set[Path] = set()
     active_started_at: list[float] = []
     for job in jobs.values():
-        if job.get("status") not in {"queued", "running"}:
+        if job.get("status") not in _ACTIVE_STATUSES:
             continue
         started_at = job.get("started_at_wall")
         if isinstance(started_at, (int, float)):
@@ -293,6 +350,7 @@ async def _cleanup_run_directories_periodically() -> None:
             await asyncio.to_thread(cleanup_run_directories)
         except Exception:
             logger.exception("Periodic web run cleanup failed")
+        prune_jobs()
 
 
 async def _start_run_cleanup() -> None:
@@ -321,8 +379,18 @@ def _trim_request_history(history: deque[float], now: float) -> None:
         history.popleft()
 
 
-def prune_jobs(reserved_slots: int = 0) -> None:
-    """Keep in-memory state bounded while reserving room for newly accepted jobs."""
+def prune_jobs(reserved_slots: int = 0, now: float | None = None) -> None:
+    """Forget expired finished jobs, then keep state bounded with room for new jobs."""
+    now = time.monotonic() if now is None else now
+    for job_id, job in list(jobs.items()):
+        finished_at = job.get("finished_at")
+        if (
+            job.get("status") in _TERMINAL_STATUSES
+            and isinstance(finished_at, (int, float))
+            and now - finished_at >= WEB_RUN_TTL_SECONDS
+        ):
+            jobs.pop(job_id, None)
+
     target_size = max(MAX_STORED_JOBS - reserved_slots, 0)
     overflow = len(jobs) - target_size
     if overflow <= 0:
@@ -331,7 +399,7 @@ def prune_jobs(reserved_slots: int = 0) -> None:
         (
             (job.get("finished_at", job.get("created_at", 0.0)), job_id)
             for job_id, job in jobs.items()
-            if job.get("status") in {"completed", "failed"}
+            if job.get("status") in _TERMINAL_STATUSES
         ),
         key=lambda item: item[0],
     )
@@ -359,7 +427,7 @@ def enforce_generation_limits(client_id: str, now: float | None = None) -> None:
             detail="Job storage capacity reached. Please try again later.",
         )
 
-    active_jobs = sum(job.get("status") in {"queued", "running"} for job in jobs.values())
+    active_jobs = sum(job.get("status") in _ACTIVE_STATUSES for job in jobs.values())
     if active_jobs >= MAX_ACTIVE_JOBS:
         raise HTTPException(status_code=429, detail="Generator is busy; please try again later")
 
@@ -392,6 +460,13 @@ _PROGRESS_AGENTS = {
 }
 
 
+def _notify_status_listeners(job_id: str) -> None:
+    """Wake open status streams for a job; bursts of updates coalesce into one."""
+    for changed in status_listeners.get(job_id, ()):
+        if changed.empty():
+            changed.put_nowait(None)
+
+
 def update_job_progress(job_id: str, event: PipelineProgressEvent) -> None:
     """Translate structured pipeline progress into the web API job state."""
     job = jobs.get(job_id)
@@ -401,11 +476,11 @@ def update_job_progress(job_id: str, event: PipelineProgressEvent) -> None:
     stage_name = event.stage.value
     agent_name = stage_name.removesuffix("_start").removesuffix("_end")
     phase, agent = _PROGRESS_AGENTS.get(agent_name, (job.get("phase"), agent_name))
-    job["phase"] = phase
-    job["agent"] = agent
-    job["progress"] = event.message
+    update = {"phase": phase, "agent": agent, "progress": event.message}
     if event.iteration is not None:
-        job["iteration"] = event.iteration
+        update["iteration"] = event.iteration
+    job.update(update)
+    _notify_status_listeners(job_id)
 
 
 def _verified_image_media_type(image_path: Path) -> str:
@@ -453,15 +528,27 @@ def _validated_web_output(image_path: object) -> tuple[Path, Path]:
     return resolved_image, run_dir
 
 
+def _image_url(job_id: str, image_path: str | Path) -> str:
+    return f"/api/result/{job_id}/image/{Path(image_path).name}"
+
+
 async def run_generation(job_id: str, text: str, caption: str, iterations: int):
-    """Background task to run the PaperBanana generation pipeline."""
+    """Run the PaperBanana generation pipeline for one queued job."""
+    job = jobs[job_id]
+    log = logger.bind(job_id=job_id)
     try:
-        jobs[job_id]["status"] = "running"
-        jobs[job_id]["started_at_wall"] = time.time()
-        jobs[job_id]["phase"] = "initialization"
-        jobs[job_id]["progress"] = "Initializing pipeline..."
+        job.update(
+            {
+                "status": "running",
+                "started_at_wall": time.time(),
+                "phase": "initialization",
+                "progress": "Initializing pipeline...",
+                "total_iterations": iterations,
+            }
+        )
+        _notify_status_listeners(job_id)
 
-        logger.info("Starting generation", job_id=job_id)
+        log.info("Starting generation")
 
         settings = Settings()
         settings.refinement_iterations = iterations
@@ -479,44 +566,113 @@ async def run_generation(job_id: str, text: str, caption: str, iterations: int):
             communicative_intent=caption,
         )
 
-        jobs[job_id]["total_iterations"] = iterations
         output = await pipeline.generate(
             input_data,
-            progress_callback=lambda event: update_job_progress(job_id, event),
+            progress_callback=functools.partial(update_job_progress, job_id),
         )
 
         final_image, run_dir = _validated_web_output(output.image_path)
+        iteration_images = [str(it.image_path) for it in output.iterations]
 
         # Store results only after validating the pipeline's final artifact.
-        jobs[job_id]["status"] = "completed"
-        jobs[job_id]["phase"] = "completed"
-        jobs[job_id]["progress"] = "Generation completed!"
-        jobs[job_id]["final_image"] = str(final_image)
-        jobs[job_id]["iteration_images"] = [str(it.image_path) for it in output.iterations]
-        jobs[job_id]["run_dir"] = str(run_dir)
-        jobs[job_id]["finished_at"] = time.monotonic()
+        job.update(
+            {
+                "status": "completed",
+                "phase": "completed",
+                "progress": "Generation completed!",
+                "final_image": str(final_image),
+                "iteration_images": iteration_images,
+                "final_image_url": _image_url(job_id, final_image),
+                "iteration_image_urls": [_image_url(job_id, path) for path in iteration_images],
+                "run_dir": str(run_dir),
+                "finished_at": time.monotonic(),
+            }
+        )
+        _notify_status_listeners(job_id)
         prune_jobs()
 
-        logger.info("Generation completed", job_id=job_id)
+        log.info("Generation completed")
 
     except Exception as exc:
-        logger.error("Generation failed", job_id=job_id, error=str(exc))
-        jobs[job_id]["status"] = "failed"
-        jobs[job_id]["phase"] = "failed"
-        jobs[job_id]["error"] = "Generation failed. Please try again later."
-        jobs[job_id]["finished_at"] = time.monotonic()
+        log.error("Generation failed", error=str(exc))
+        job.update(
+            {
+                "status": "failed",
+                "phase": "failed",
+                "error": "Generation failed. Please try again later.",
+                "finished_at": time.monotonic(),
+            }
+        )
+        _notify_status_listeners(job_id)
         prune_jobs()
 
 
+async def _generation_worker(queue: asyncio.Queue[tuple[str, str, str, int]]) -> None:
+    """Run queued generation jobs one at a time for the lifetime of the app."""
+    while True:
+        job_id = None
+        try:
+            job_id, text, caption, iterations = await queue.get()
+            try:
+                await run_generation(job_id, text, caption, iterations)
+            finally:
+                queue.task_done()
+        except Exception:
+            logger.exception("Generation worker failed", job_id=job_id)
+
+
+async def _start_generation_workers() -> None:
+    global generation_queue
+    generation_queue = asyncio.Queue()
+    _generation_workers.extend(
+        asyncio.create_task(_generation_worker(generation_queue))
+        for _ in range(WEB_GENERATION_WORKERS)
+    )
+
+
+async def _stop_generation_workers() -> None:
+    global generation_queue
+    for task in _generation_workers:
+        task.cancel()
+    await asyncio.gather(*_generation_workers, return_exceptions=True)
+    _generation_workers.clear()
+    generation_queue = None
+    # Cancelled workers leave their running job behind, and queued jobs can never start
+    # once their queue is gone; fail both so neither blocks admission or run cleanup.
+    for job_id, job in jobs.items():
+        if job.get("status") in _ACTIVE_STATUSES:
+            job.update(
+                {
+                    "status": "failed",
+                    "phase": "failed",
+                    "error": "Generator stopped before the job finished. Please try again.",
+                    "finished_at": time.monotonic(),
+                }
+            )
+            _notify_status_listeners(job_id)
+
+
+app.router.add_event_handler("startup", _start_generation_workers)
+app.router.add_event_handler("shutdown", _stop_generation_workers)
+
+
+def _queued_progress_message(queue: asyncio.Queue[tuple[str, str, str, int]]) -> str:
+    """Describe whether a newly queued job can start immediately or must wait."""
+    running_jobs = sum(job.get("status") == "running" for job in jobs.values())
+    if running_jobs < WEB_GENERATION_WORKERS and queue.empty():
+        return "Job queued..."
+    return "Waiting for a free generation worker..."
+
+
 @app.post("/api/generate", response_model=GenerateResponse)
-async def generate(
-    request: GenerateRequest,
-    background_tasks: BackgroundTasks,
-    http_request: Request,
-):
+async def generate(request: GenerateRequest, http_request: Request):
     """Start a new diagram generation job within configured safety limits."""
+    queue = generation_queue
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Generator is not running")
     enforce_generation_limits(_client_id(http_request))
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
+    progress = _queued_progress_message(queue)
 
     jobs[job_id] = {
         "job_id": job_id,
@@ -527,27 +683,18 @@ async def generate(
         "agent": None,
         "iteration": None,
         "total_iterations": request.iterations,
-        "progress": "Job queued...",
+        "progress": progress,
         "final_image": None,
         "iteration_images": [],
         "error": None,
     }
 
-    # Schedule background task
-    background_tasks.add_task(
-        run_generation, job_id, request.text, request.caption, request.iterations
-    )
+    queue.put_nowait((job_id, request.text, request.caption, request.iterations))
 
     return GenerateResponse(job_id=job_id, status="queued")
 
 
-@app.get("/api/status/{job_id}", response_model=StatusResponse)
-async def get_status(job_id: str):
-    """Get the status of a generation job."""
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    job = jobs[job_id]
+def _status_response(job_id: str, job: dict) -> StatusResponse:
     return StatusResponse(
         job_id=job_id,
         status=job["status"],
@@ -560,35 +707,54 @@ async def get_status(job_id: str):
     )
 
 
-@app.get("/api/result/{job_id}", response_model=ResultResponse)
-async def get_result(job_id: str):
-    """Get the result of a completed generation job."""
-    if job_id not in jobs:
+def _existing_job(job_id: str) -> dict:
+    """Resolve a job ID for the job endpoints, answering 404 when it is unknown."""
+    job = jobs.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
-    job = jobs[job_id]
 
-    if job["status"] not in ["completed", "failed"]:
-        raise HTTPException(status_code=400, detail="Job not yet completed")
+@app.get("/api/status/{job_id}", response_model=StatusResponse)
+async def get_status(job_id: str, job: dict = Depends(_existing_job)):
+    """Get the status of a generation job."""
+    return _status_response(job_id, job)
 
-    # Convert file paths to URLs
-    final_image_url = None
-    iteration_image_urls = []
 
-    if job["status"] == "completed":
-        if job.get("final_image"):
-            filename = Path(job["final_image"]).name
-            final_image_url = f"/api/result/{job_id}/image/{filename}"
+@app.get("/api/status/{job_id}/stream", response_class=EventSourceResponse)
+async def stream_status(
+    job_id: str, job: dict = Depends(_existing_job)
+) -> AsyncIterator[StatusResponse]:
+    """Push the job status as server-sent events each time it changes."""
+    changed: asyncio.Queue[None] = asyncio.Queue(maxsize=1)
+    listeners = status_listeners.setdefault(job_id, set())
+    listeners.add(changed)
+    try:
+        while True:
+            # Decide on the snapshot just sent so a change made while the client was
+            # reading it is still delivered.
+            status = _status_response(job_id, job)
+            yield status
+            if status.status in _TERMINAL_STATUSES:
+                return
+            await changed.get()
+    finally:
+        listeners.discard(changed)
+        if not listeners:
+            status_listeners.pop(job_id, None)
 
-        for img_path in job.get("iteration_images", []):
-            filename = Path(img_path).name
-            iteration_image_urls.append(f"/api/result/{job_id}/image/{filename}")
+
+@app.get("/api/result/{job_id}", response_model=ResultResponse)
+async def get_result(job_id: str, job: dict = Depends(_existing_job)):
+    """Get the result of a completed generation job."""
+    if job["status"] not in _TERMINAL_STATUSES:
+        raise HTTPException(status_code=400, detail="Job not yet completed")
 
     return ResultResponse(
         job_id=job_id,
         status=job["status"],
-        final_image=final_image_url,
-        iteration_images=iteration_image_urls,
+        final_image=job.get("final_image_url"),
+        iteration_images=job.get("iteration_image_urls", []),
         error=job.get("error"),
     )
 
@@ -623,16 +789,33 @@ async def get_image(job_id: str, filename: str):
         image_path,
         media_type=media_type,
         filename=image_path.name,
-        headers={"X-Content-Type-Options": "nosniff"},
+        headers={
+            "X-Content-Type-Options": "nosniff",
+            # Recorded images never change once a job completes.
+            "Cache-Control": f"private, max-age={int(WEB_RUN_TTL_SECONDS)}, immutable",
+        },
     )
 
 
+FRONTEND_HTML_PATH = Path(__file__).parent / "static" / "index.html"
+
+
+async def _load_frontend() -> None:
+    """Read the single-page frontend once so `GET /` never touches the disk."""
+    try:
+        app.state.index_html = await asyncio.to_thread(FRONTEND_HTML_PATH.read_bytes)
+    except FileNotFoundError:
+        app.state.index_html = None
+
+
+app.router.add_event_handler("startup", _load_frontend)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
-    """Serve the frontend HTML."""
-    html_path = Path(__file__).parent / "static" / "index.html"
-
-    if not html_path.exists():
+    """Serve the frontend HTML cached at startup."""
+    index_html = getattr(app.state, "index_html", None)
+    if index_html is None:
         return HTMLResponse(
             content=(
                 "<h1>PaperBanana Web UI</h1>"
@@ -641,8 +824,7 @@ async def root():
             status_code=404,
         )
 
-    with open(html_path, "r") as f:
-        return HTMLResponse(content=f.read())
+    return HTMLResponse(content=index_html)
 
 
 # Mount static files